@@ -0,0 +1,503 @@
+""" Selenium interface to the 2048 web game. """
+from typing import List, Optional, Tuple
+import base64
+import os
+import re
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from io import BytesIO
+from threading import Lock, Thread
+import numpy as np
+from PIL import Image
+from selenium.webdriver import Chrome
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException)
+
+
+# key names and codes for up, left, down, right
+_KEYS = ['ArrowUp', 'ArrowLeft', 'ArrowDown', 'ArrowRight']
+_KEY_CODES = [38, 37, 40, 39]
+
+_SCORE_RE = re.compile(r'\d+')
+
+# seconds the driver waits on a script, step_many extends it for long calls
+# --each move can take a few frames past its delay to settle
+_SCRIPT_TIMEOUT = 30
+_MOVE_OVERHEAD = 0.1
+
+# keep timers and frames running at full rate, skip what the game never uses
+_CHROME_ARGS = [
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--mute-audio']
+
+# for headless runs in containers/CI, headed chrome would show a warning bar
+_HEADLESS_CHROME_ARGS = [
+    '--headless',
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--no-sandbox']
+
+# page assets not needed to play or screenshot the board (drawn with css)
+_BLOCKED_URLS = [
+    '*/fonts/*',
+    '*fonts.googleapis.com*',
+    '*.woff*',
+    '*.ttf',
+    '*.png',
+    '*.ico']
+
+# reads the whole board as log2 of each tile, tile classes are 1-indexed
+# --moving tiles are drawn at their old position for a frame
+# --merging tiles share a cell with the merged tile that replaces them
+_READ_STATE_JS = """
+function readState() {
+    const state = [[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]];
+    const cells = {};
+    for (const tile of document.querySelectorAll('.tile-container .tile')) {
+        const pos = tile.className.match(/tile-position-(\\d)-(\\d)/);
+        if (!(pos[0] in cells)) {
+            cells[pos[0]] = {col: pos[1], row: pos[2], tiles: []};
+        }
+        cells[pos[0]].tiles.push(tile);
+    }
+    for (const {col, row, tiles} of Object.values(cells)) {
+        const tile = tiles.length === 1 ?
+            tiles[0] : tiles.find(t => t.classList.contains('tile-merged'));
+        const num = tile === undefined ? NaN : parseInt(tile.textContent);
+        if (isNaN(num)) {
+            return null;  // need to wait for game to stabilize
+        }
+        state[row - 1][col - 1] = Math.log2(num);
+    }
+    return state;
+}
+"""
+
+# resolves once the board has stopped animating or the timeout (ms) passes
+# --the game redraws on the next frame and starts tile slides a frame later
+# --.tile-new/.tile-merged classes stay on finished tiles so check animations
+_SETTLE_JS = """
+function nextFrame() {
+    return new Promise(resolve => requestAnimationFrame(resolve));
+}
+async function settle(timeout) {
+    const deadline = performance.now() + timeout;
+    const tiles = document.querySelector('.tile-container');
+    await nextFrame();
+    do {
+        await nextFrame();
+    } while (tiles.getAnimations({subtree: true}).length > 0 &&
+             performance.now() < deadline);
+}
+"""
+
+_READ_IS_OVER_JS = """
+function readIsOver() {
+    return document.querySelector('.game-over') !== null;
+}
+"""
+
+_GET_STATE_JS = _READ_STATE_JS + """
+return readState();
+"""
+
+_IS_OVER_JS = _READ_IS_OVER_JS + """
+return readIsOver();
+"""
+
+# game starts fresh on its own if not created yet
+_RESTART_JS = """
+if (window.gameManager) {
+    window.gameManager.restart();
+}
+"""
+
+_ADD_STYLE_JS = """
+const style = document.createElement('style');
+style.textContent = arguments[0];
+document.head.appendChild(style);
+"""
+
+# tiles jump straight to where they end up so moves settle in a frame
+_NO_ANIMATION_CSS = """
+.tile, .tile-inner {
+    transition: none !important;
+    animation: none !important;
+}
+"""
+
+_IS_STABLE_JS = """
+const callback = arguments[arguments.length - 1];
+requestAnimationFrame(() => requestAnimationFrame(() => callback(
+    document.querySelector('.tile-container')
+        .getAnimations({subtree: true}).length === 0)));
+"""
+
+# presses a key, waits for the board, and reports [state, reward, done]
+_MOVE_JS = _READ_STATE_JS + _READ_IS_OVER_JS + _SETTLE_JS + """
+function readScore() {
+    return parseInt(document.querySelector('.score-container').textContent);
+}
+async function move(key, timeout) {
+    const before = readScore();
+    document.dispatchEvent(new KeyboardEvent(
+        'keydown', {keyCode: key, which: key, bubbles: true}));
+    await settle(timeout);
+    return [readState(), readScore() - before, readIsOver()];
+}
+"""
+
+_STEP_JS = _MOVE_JS + """
+const [key, timeout, callback] = arguments;
+move(key, timeout).then(callback);
+"""
+
+# stops early if the game ends
+_STEP_MANY_JS = _MOVE_JS + """
+const [keys, timeout, callback] = arguments;
+(async () => {
+    const trajectory = [];
+    for (const key of keys) {
+        trajectory.push(await move(key, timeout));
+        if (trajectory[trajectory.length - 1][2]) {
+            break;
+        }
+    }
+    return trajectory;
+})().then(callback);
+"""
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """ Serves game files without logging every request. """
+    def log_message(self, format: str, *args) -> None:
+        """ Skip request logging. """
+
+
+class Game2048(Chrome):
+    """ Interface for a reinforcement learning agent to play 2048. """
+    _server = None  # serves game files to every game in this process
+    _server_lock = Lock()
+
+    def __init__(self,
+                 path: str,
+                 headless: bool = False,
+                 height: int = 600,
+                 width: int = 500,
+                 img_size: int = 128) -> None:
+        """ Constructor.
+
+        :param path:     path to chromedriver
+        :type  path:     str
+        :param headless: run browser headless or not, defaults to False
+        :type  headless: bool, optional
+        :param height:   window height in pixels, defaults to 500
+        :type  height:   int, optional
+        :param width:    window width in pixels, defaults to 500
+        :type  width:    int, optional
+        :param img_size: game board screenshot size in pixels, defaults to 128
+        :type  img_size: int, optional
+        """
+        options = Options()
+        for arg in _CHROME_ARGS + (_HEADLESS_CHROME_ARGS if headless else []):
+            options.add_argument(arg)
+        options.add_experimental_option(
+            'prefs', {'profile.managed_default_content_settings.images': 2})
+        super(Game2048, self).__init__(path, options=options)
+
+        # store vars
+        self.path = path
+        self.headless = headless
+        self.height = height
+        self.width = width
+        self.img_size = img_size
+
+        # misc setup
+        self.set_window_size(width, height)  # if too small screenshot cropped
+        self.set_script_timeout(_SCRIPT_TIMEOUT)
+
+        # load game files
+        self.execute_cdp_cmd('Network.enable', {})
+        self.execute_cdp_cmd('Network.setBlockedURLs', {'urls': _BLOCKED_URLS})
+        self.get(f'http://127.0.0.1:{self._serve_game()}/index.html')
+        self.execute_script(_ADD_STYLE_JS, _NO_ANIMATION_CSS)
+
+        # cache handles to elements that are read every step
+        self._score_el = self.find_element_by_class_name('score-container')
+        self._grid_el = self.find_element_by_class_name('grid-container')
+        self._grid_clip = None  # screenshot region, found on first screenshot
+        self._state_buf = np.zeros((4, 4), dtype=np.uint8)
+        self._frame_buf = np.empty((img_size, img_size, 3), dtype=np.uint8)
+
+    def __enter__(self):
+        """ Open browser and game. """
+        super(Game2048, self).__enter__()
+        return self
+
+    def __repr__(self) -> str:
+        """ Representation.
+
+        :return: Game instantiation settings
+        :rtype:  str
+        """
+        return ''.join([
+            'Game2048(',
+            f'path="{self.path}", ',
+            f'headless={self.headless}, ',
+            f'height={self.height}, ',
+            f'width={self.width}, ',
+            f'img_size={self.img_size}'
+            ')'])
+
+    @classmethod
+    def _serve_game(cls) -> int:
+        """ Start serving game files over HTTP if not already.
+            Pages from a local server can be cached, unlike file:// ones.
+
+        :return: server port
+        :rtype:  int
+        """
+        with cls._server_lock:
+            if cls._server is None:
+                game_dir = Path(os.path.dirname(__file__)) / 'game'
+                handler = partial(_QuietHandler, directory=str(game_dir))
+                cls._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+                Thread(target=cls._server.serve_forever, daemon=True).start()
+        return cls._server.server_address[1]
+
+    def step(self,
+             action: int,
+             delay: float = 0.5) -> Tuple[np.ndarray, float, bool, dict]:
+        """ Advance the environment based on agent action.
+
+        :param action: up (0), left (1), down (2), right (3)
+        :type  action: int
+        :param delay:  max seconds to wait for game to update, defaults to 0.5
+        :type  delay:  float, optional
+        :return:       state (its own array), reward, whether game over,
+                       debug info
+        :rtype:        Tuple[np.ndarray, float, bool, dict]
+        """
+        tiles, reward, done = self.execute_async_script(
+            _STEP_JS, _KEY_CODES[action], delay * 1000)
+        if tiles is None:
+            tiles = self._read_tiles()  # board did not settle within delay
+        return np.array(tiles, dtype=np.uint8), reward, done, {}
+
+    def step_many(
+            self,
+            actions: List[int],
+            delay: float = 0.5) -> List[Tuple[np.ndarray, float, bool, dict]]:
+        """ Advance the environment based on several agent actions at once.
+            Stops early if the game ends. Each state is its own array.
+
+        :param actions: up (0), left (1), down (2), right (3) for each step
+        :type  actions: List[int]
+        :param delay:   max seconds to wait for game to update per step,
+                        defaults to 0.5
+        :type  delay:   float, optional
+        :raises TimeoutException: if the board does not stabilize in time,
+                                  raised after every move has been played
+                                  so the call cannot be safely retried
+        :return:        state, reward, whether game over, debug info per step
+        :rtype:         List[Tuple[np.ndarray, float, bool, dict]]
+        """
+        # whole trajectory is one script, give the driver more time only if
+        # it could take longer than the usual timeout
+        args = (_STEP_MANY_JS, [_KEY_CODES[a] for a in actions], delay * 1000)
+        needed = len(actions) * (delay + _MOVE_OVERHEAD)
+        if needed > _SCRIPT_TIMEOUT:
+            self.set_script_timeout(_SCRIPT_TIMEOUT + needed)
+            try:
+                trajectory = self.execute_async_script(*args)
+            finally:
+                self.set_script_timeout(_SCRIPT_TIMEOUT)
+        else:
+            trajectory = self.execute_async_script(*args)
+        if any(tiles is None for tiles, _, _ in trajectory):
+            raise TimeoutException('game board did not stabilize')
+        return [
+            (np.array(tiles, dtype=np.uint8), reward, done, {})
+            for tiles, reward, done in trajectory]
+
+    def act(self, action: int) -> None:
+        """ Press an arrow key without waiting for the game to update.
+
+        :param action: up (0), left (1), down (2), right (3)
+        :type  action: int
+        """
+        key = {
+            'key': _KEYS[action],
+            'code': _KEYS[action],
+            'windowsVirtualKeyCode': _KEY_CODES[action]}
+        self.execute_cdp_cmd('Input.dispatchKeyEvent',
+                             {'type': 'rawKeyDown', **key})
+        self.execute_cdp_cmd('Input.dispatchKeyEvent',
+                             {'type': 'keyUp', **key})
+
+    def get_state(self) -> np.ndarray:
+        """ Get the 16-tile game board as log2 of each tile, 0 if empty.
+            Every call updates the same array, copy it to keep a state.
+
+        :return: game board tile exponents
+        :rtype:  np.ndarray
+        """
+        self._state_buf[:] = self._read_tiles()
+        return self._state_buf
+
+    def get_state_u64(self) -> int:
+        """ Get the 16-tile game board packed into a 64-bit integer.
+            Each tile is a 4-bit exponent, first row first col in the top bits.
+            Tiles past 32768 do not fit.
+
+        :return: packed game board
+        :rtype:  int
+        """
+        board = 0
+        for exp in self.get_state().ravel().tolist():
+            board = (board << 4) | exp
+        return board
+
+    def _read_tiles(self,
+                    timeout: float = 0.5,
+                    interval: float = 0.005) -> List[List[int]]:
+        """ Read the game board from the page once it is stable.
+            Retries with exponential backoff between tries.
+
+        :param timeout:  max seconds to wait, defaults to 0.5
+        :type  timeout:  float, optional
+        :param interval: seconds before the first retry, defaults to 0.005
+        :type  interval: float, optional
+        :raises TimeoutException: if the board does not stabilize in time
+        :return:         game board tile exponents
+        :rtype:          List[List[int]]
+        """
+        deadline = time.monotonic() + timeout
+        tiles = self.execute_script(_GET_STATE_JS)  # None until stable
+        while tiles is None:
+            if time.monotonic() >= deadline:
+                raise TimeoutException('game board did not stabilize')
+            time.sleep(interval)
+            interval = min(interval * 2, 0.05)
+            tiles = self.execute_script(_GET_STATE_JS)
+        return tiles
+
+    def get_score(self) -> int:
+        """ Get the current game score.
+
+        :return: game score
+        :rtype: int
+        """
+        try:
+            score_text = self._score_el.text  # will also include children text
+        except StaleElementReferenceException:
+            self._score_el = self.find_element_by_class_name('score-container')
+            score_text = self._score_el.text
+
+        # keep only the score
+        # --actions that increase game score create a child that shows the amt
+        # --its '+N' text comes after the score so take the leading digits
+        return int(_SCORE_RE.match(score_text).group())
+
+    def is_over(self) -> bool:
+        """ Check if game is in game over state.
+            One sign is whether or not a specific div is class 'game-over'.
+
+        :return: whether or not the game is in game over state
+        :rtype:  bool
+        """
+        return bool(self.execute_script(_IS_OVER_JS))
+
+    def reset(self, delay: float = 0.5) -> np.ndarray:
+        """ Starts a new game.
+
+        :param delay: max seconds to wait for game to reload, defaults to 0.5
+        :type  delay: float, optional
+        :return:      initial state, its own array
+        :rtype:       np.ndarray
+        """
+        self.execute_script(_RESTART_JS)
+        self._wait_stable(timeout=delay)
+        return self.get_state().copy()
+
+    def _wait_stable(self,
+                     timeout: float = 0.5,
+                     interval: float = 0.005) -> bool:
+        """ Wait for the game board to finish animating.
+
+        :param timeout:  max seconds to wait, defaults to 0.5
+        :type  timeout:  float, optional
+        :param interval: seconds between checks, defaults to 0.005
+        :type  interval: float, optional
+        :return:         whether or not the board stabilized in time
+        :rtype:          bool
+        """
+        deadline = time.monotonic() + timeout
+        while not self.execute_async_script(_IS_STABLE_JS):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+        return True
+
+    def take_screenshot(self) -> Image:
+        """ Take a screenshot of the 16-tile game board.
+
+        :return: screenshot
+        :rtype:  Image
+        """
+        if self._grid_clip is None:
+            try:
+                rect = self._grid_el.rect
+            except StaleElementReferenceException:
+                self._grid_el = self.find_element_by_class_name(
+                    'grid-container')
+                rect = self._grid_el.rect
+            self._grid_clip = {
+                **rect,
+                'scale': self.img_size / rect['width']}  # browser resizes
+
+        # jpeg skips the slow png encode, optimizeForSpeed picks fast paths
+        shot = self.execute_cdp_cmd('Page.captureScreenshot', {
+            'format': 'jpeg',
+            'quality': 70,
+            'optimizeForSpeed': True,
+            'clip': self._grid_clip})
+        pseudofile = BytesIO(base64.b64decode(shot['data']))
+        img = Image.open(pseudofile)
+        if img.size != (self.img_size, self.img_size):
+            # jpeg can decode at 1/2, 1/4, 1/8 size so decode as little as
+            # possible before resizing, e.g. on high dpi screens
+            img.draft('RGB', (self.img_size, self.img_size))
+            img = img.resize((self.img_size, self.img_size))
+        return img
+
+    def take_screenshot_into(self,
+                             out: Optional[np.ndarray] = None) -> np.ndarray:
+        """ Take a screenshot of the 16-tile game board into an array.
+            Without out, every call writes to the same internal buffer,
+            which can be wrapped once with torch.from_numpy.
+
+        :param out: uint8 array of shape (img_size, img_size, 3) to write to,
+                    defaults to an internal buffer
+        :type  out: np.ndarray, optional
+        :raises ValueError: if out is not a C-contiguous uint8 array of
+                            shape (img_size, img_size, 3)
+        :return:    screenshot
+        :rtype:     np.ndarray
+        """
+        shape = (self.img_size, self.img_size, 3)
+        if out is None:
+            out = self._frame_buf
+        elif (out.dtype != np.uint8 or out.shape != shape
+              or not out.flags.c_contiguous or not out.flags.writeable):
+            raise ValueError(
+                f'out must be a writeable C-contiguous uint8 array of shape '
+                f'{shape}, got {out.dtype} array of shape {out.shape}')
+        np.copyto(out, np.asarray(self.take_screenshot()))
+        return out
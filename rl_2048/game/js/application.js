@@ -1,4 +1,6 @@
 // Wait till the browser is ready to render the game (avoids glitches)
 window.requestAnimationFrame(function () {
-  new GameManager(4, KeyboardInputManager, HTMLActuator, LocalStorageManager);
+  // Exposed so scripts can restart the game directly
+  window.gameManager = new GameManager(4, KeyboardInputManager, HTMLActuator,
+                                       LocalStorageManager);
 });
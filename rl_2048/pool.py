@@ -0,0 +1,77 @@
+""" Reuse browsers across games. """
+from typing import Iterator
+from contextlib import contextmanager
+from queue import Queue
+from rl_2048.browser import Game2048
+
+
+class Game2048Pool:
+    """ Browsers kept open between games so a new game only costs a reset. """
+    def __init__(self, k: int, path: str, **kwargs) -> None:
+        """ Constructor.
+
+        :param k:      number of browsers to keep open
+        :type  k:      int
+        :param path:   path to chromedriver
+        :type  path:   str
+        :param kwargs: other Game2048 constructor arguments
+        :type  kwargs: dict
+        """
+        # store vars
+        self.k = k
+        self.path = path
+        self.kwargs = kwargs
+
+        # open every browser up front, closing those opened if one fails
+        self._games = []
+        try:
+            for _ in range(k):
+                self._games.append(Game2048(path, **kwargs))
+        except BaseException:
+            self.close()
+            raise
+        self._idle = Queue()
+        for game in self._games:
+            self._idle.put(game)
+
+    def __enter__(self):
+        """ Use pool, browsers are already open. """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """ Close browsers. """
+        self.close()
+
+    def __repr__(self) -> str:
+        """ Representation.
+
+        :return: Pool instantiation settings
+        :rtype:  str
+        """
+        return ''.join([
+            'Game2048Pool(',
+            f'k={self.k}, ',
+            f'path="{self.path}"',
+            *[f', {key}={val!r}' for key, val in self.kwargs.items()],
+            ')'])
+
+    @contextmanager
+    def acquire(self, delay: float = 0.5) -> Iterator[Game2048]:
+        """ Borrow a game for one episode, waits if every game is in use.
+
+        :param delay: max seconds to wait for game to reload, defaults to 0.5
+        :type  delay: float, optional
+        :return:      game that has just been reset
+        :rtype:       Iterator[Game2048]
+        """
+        game = self._idle.get()
+        try:
+            game.reset(delay)
+            yield game
+        finally:
+            self._idle.put(game)
+
+    def close(self) -> None:
+        """ Close every browser. """
+        for game in self._games:
+            game.quit()
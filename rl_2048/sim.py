@@ -0,0 +1,237 @@
+""" Browser-free 2048 for fast training. """
+from typing import List, Optional, Tuple
+import numpy as np
+
+
+def _move_row_left(tiles: List[int]) -> Tuple[List[int], int]:
+    """ Slide and merge one row of tile exponents toward the first col.
+
+    :param tiles: tile exponents, 0 if empty
+    :type  tiles: List[int]
+    :return:      tile exponents after the move, points scored
+    :rtype:       Tuple[List[int], int]
+    """
+    tiles = [exp for exp in tiles if exp > 0]
+    moved, reward = [], 0
+    while tiles:
+        exp = tiles.pop(0)
+        if tiles and tiles[0] == exp and exp < 15:  # 32768 is the max tile
+            tiles.pop(0)
+            exp += 1
+            reward += 1 << exp
+        moved.append(exp)
+    return moved + [0] * (4 - len(moved)), reward
+
+
+def _build_tables() -> Tuple[List[int], List[int], List[int], List[int]]:
+    """ Precompute moves for every possible row.
+        A row is 4 tile exponents packed into 16 bits, first col in the top.
+
+    :return: rows after moving left, points scored moving left, rows after
+             moving right, points scored moving right
+    :rtype:  Tuple[List[int], List[int], List[int], List[int]]
+    """
+    left_rows, left_rewards = [0] * 65536, [0] * 65536
+    right_rows, right_rewards = [0] * 65536, [0] * 65536
+    for row in range(65536):
+        tiles = [(row >> shift) & 0xF for shift in (12, 8, 4, 0)]
+        moved, reward = _move_row_left(tiles)
+        left_rows[row] = (
+            moved[0] << 12 | moved[1] << 8 | moved[2] << 4 | moved[3])
+        left_rewards[row] = reward
+
+        # moving right is moving the mirrored row left
+        moved, reward = _move_row_left(tiles[::-1])
+        right_rows[row] = (
+            moved[3] << 12 | moved[2] << 8 | moved[1] << 4 | moved[0])
+        right_rewards[row] = reward
+    return left_rows, left_rewards, right_rows, right_rewards
+
+
+_LEFT_ROWS, _LEFT_REWARDS, _RIGHT_ROWS, _RIGHT_REWARDS = _build_tables()
+
+
+def _transpose(board: int) -> int:
+    """ Swap rows and cols of a packed board.
+
+    :param board: packed game board
+    :type  board: int
+    :return:      transposed game board
+    :rtype:       int
+    """
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    board = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = board & 0xFF00FF0000FF00FF
+    b2 = board & 0x00FF00FF00000000
+    b3 = board & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _move_rows(board: int,
+               rows: List[int],
+               rewards: List[int]) -> Tuple[int, int]:
+    """ Move every row of a packed board with a precomputed table.
+
+    :param board:   packed game board
+    :type  board:   int
+    :param rows:    rows after the move, indexed by row before the move
+    :type  rows:    List[int]
+    :param rewards: points scored by the move, indexed by row
+    :type  rewards: List[int]
+    :return:        game board after the move, points scored
+    :rtype:         Tuple[int, int]
+    """
+    moved, reward = 0, 0
+    for shift in (48, 32, 16, 0):
+        row = (board >> shift) & 0xFFFF
+        moved |= rows[row] << shift
+        reward += rewards[row]
+    return moved, reward
+
+
+def _move(board: int, action: int) -> Tuple[int, int]:
+    """ Apply an action to a packed board without adding a new tile.
+
+    :param board:  packed game board
+    :type  board:  int
+    :param action: up (0), left (1), down (2), right (3)
+    :type  action: int
+    :return:       game board after the move, points scored
+    :rtype:        Tuple[int, int]
+    """
+    if action == 1:
+        return _move_rows(board, _LEFT_ROWS, _LEFT_REWARDS)
+    if action == 3:
+        return _move_rows(board, _RIGHT_ROWS, _RIGHT_REWARDS)
+
+    # cols become rows, up is left and down is right
+    if action == 0:
+        moved, reward = _move_rows(
+            _transpose(board), _LEFT_ROWS, _LEFT_REWARDS)
+    else:
+        moved, reward = _move_rows(
+            _transpose(board), _RIGHT_ROWS, _RIGHT_REWARDS)
+    return _transpose(moved), reward
+
+
+class Game2048Sim:
+    """ 2048 played in Python with the same interface as Game2048.
+        The board is a 64-bit integer of 4-bit tile exponents, first row
+        first col in the top bits, and moves are table lookups per row.
+    """
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """ Constructor.
+
+        :param seed: random seed for new tiles, defaults to None
+        :type  seed: int, optional
+        """
+        # store vars
+        self.seed = seed
+
+        # misc setup
+        self._rng = np.random.default_rng(seed)
+        self._state_buf = np.zeros((4, 4), dtype=np.uint8)
+        self.board = 0
+        self.score = 0
+        self.reset()
+
+    def __enter__(self):
+        """ Start game. """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """ Nothing to close, here to match Game2048. """
+
+    def __repr__(self) -> str:
+        """ Representation.
+
+        :return: Game instantiation settings
+        :rtype:  str
+        """
+        return f'Game2048Sim(seed={self.seed})'
+
+    def step(self,
+             action: int,
+             delay: float = 0.5) -> Tuple[np.ndarray, float, bool, dict]:
+        """ Advance the environment based on agent action.
+            Moves that change nothing score nothing and add no tile.
+
+        :param action: up (0), left (1), down (2), right (3)
+        :type  action: int
+        :param delay:  unused, here to match Game2048, defaults to 0.5
+        :type  delay:  float, optional
+        :return:       state (its own array), reward, whether game over,
+                       debug info
+        :rtype:        Tuple[np.ndarray, float, bool, dict]
+        """
+        board, reward = _move(self.board, action)
+        if board != self.board:
+            self.board = self._add_tile(board)
+            self.score += reward
+        return self.get_state().copy(), reward, self.is_over(), {}
+
+    def get_state(self) -> np.ndarray:
+        """ Get the 16-tile game board as log2 of each tile, 0 if empty.
+            Every call updates the same array, copy it to keep a state.
+
+        :return: game board tile exponents
+        :rtype:  np.ndarray
+        """
+        packed = np.frombuffer(self.board.to_bytes(8, 'big'), dtype=np.uint8)
+        flat = self._state_buf.reshape(-1)
+        np.right_shift(packed, 4, out=flat[0::2])
+        np.bitwise_and(packed, 0xF, out=flat[1::2])
+        return self._state_buf
+
+    def get_state_u64(self) -> int:
+        """ Get the 16-tile game board packed into a 64-bit integer.
+
+        :return: packed game board
+        :rtype:  int
+        """
+        return self.board
+
+    def get_score(self) -> int:
+        """ Get the current game score.
+
+        :return: game score
+        :rtype:  int
+        """
+        return self.score
+
+    def is_over(self) -> bool:
+        """ Check if no action changes the board.
+
+        :return: whether or not the game is in game over state
+        :rtype:  bool
+        """
+        return all(_move(self.board, action)[0] == self.board
+                   for action in range(4))
+
+    def reset(self, delay: float = 0.5) -> np.ndarray:
+        """ Starts a new game.
+
+        :param delay: unused, here to match Game2048, defaults to 0.5
+        :type  delay: float, optional
+        :return:      initial state, its own array
+        :rtype:       np.ndarray
+        """
+        self.board = self._add_tile(self._add_tile(0))
+        self.score = 0
+        return self.get_state().copy()
+
+    def _add_tile(self, board: int) -> int:
+        """ Put a 2 (90%) or 4 (10%) on a random empty cell like the game.
+
+        :param board: packed game board with at least one empty cell
+        :type  board: int
+        :return:      game board with the new tile
+        :rtype:       int
+        """
+        empty = [shift for shift in range(0, 64, 4)
+                 if not (board >> shift) & 0xF]
+        shift = empty[self._rng.integers(len(empty))]
+        exp = 1 if self._rng.random() < 0.9 else 2
+        return board | exp << shift
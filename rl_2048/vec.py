@@ -0,0 +1,141 @@
+""" Run several 2048 games in parallel. """
+from typing import List, Tuple
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+import numpy as np
+from rl_2048.browser import Game2048
+
+
+def _worker(conn: Connection, path: str, kwargs: dict) -> None:
+    """ Play one game, following commands from the parent process.
+
+    :param conn:   worker end of the pipe to the parent process
+    :type  conn:   Connection
+    :param path:   path to chromedriver
+    :type  path:   str
+    :param kwargs: other Game2048 constructor arguments
+    :type  kwargs: dict
+    """
+    with Game2048(path, **kwargs) as game:
+        while True:
+            cmd, data = conn.recv()
+            if cmd == 'step':
+                state, reward, done, info = game.step(data)
+                if done:
+                    # start the next game right away like SB3 SubprocVecEnv
+                    info['terminal_state'] = state
+                    state = game.reset()
+                conn.send((state, reward, done, info))
+            elif cmd == 'reset':
+                conn.send(game.reset())
+            elif cmd == 'close':
+                break
+    conn.close()
+
+
+class VecGame2048:
+    """ Several 2048 games, each played by a browser in its own process. """
+    def __init__(self, n_envs: int, path: str, **kwargs) -> None:
+        """ Constructor.
+
+        :param n_envs: number of games to play in parallel
+        :type  n_envs: int
+        :param path:   path to chromedriver
+        :type  path:   str
+        :param kwargs: other Game2048 constructor arguments, headless=True
+                       unless specified
+        :type  kwargs: dict
+        """
+        kwargs.setdefault('headless', True)
+
+        # store vars
+        self.n_envs = n_envs
+        self.path = path
+        self.kwargs = kwargs
+
+        # start one worker per game
+        self._conns = []
+        self._procs = []
+        for _ in range(n_envs):
+            parent_conn, child_conn = Pipe()
+            proc = Process(target=_worker,
+                           args=(child_conn, path, kwargs),
+                           daemon=True)
+            proc.start()
+            child_conn.close()  # only the worker uses this end
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+        self.closed = False
+
+    def __enter__(self):
+        """ Start games. """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """ Close games. """
+        self.close()
+
+    def __repr__(self) -> str:
+        """ Representation.
+
+        :return: Game instantiation settings
+        :rtype:  str
+        """
+        return ''.join([
+            'VecGame2048(',
+            f'n_envs={self.n_envs}, ',
+            f'path="{self.path}"',
+            *[f', {key}={val!r}' for key, val in self.kwargs.items()],
+            ')'])
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray,
+                                                 np.ndarray,
+                                                 np.ndarray,
+                                                 List[dict]]:
+        """ Advance every game based on agent actions.
+            Finished games restart right away, the state they ended on is in
+            their debug info under 'terminal_state'.
+
+        :param actions: one action per game, up (0), left (1), down (2),
+                        right (3)
+        :type  actions: np.ndarray
+        :raises ValueError: if there is not exactly one action per game
+        :return:        states, rewards, whether games over, debug infos
+        :rtype:         Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]
+        """
+        if len(actions) != self.n_envs:
+            raise ValueError(
+                f'expected {self.n_envs} actions, got {len(actions)}')
+        for conn, action in zip(self._conns, actions):
+            conn.send(('step', int(action)))
+        states, rewards, dones, infos = zip(*[c.recv() for c in self._conns])
+        return (
+            np.stack(states),
+            np.array(rewards, dtype=np.float32),
+            np.array(dones, dtype=bool),
+            list(infos))
+
+    def reset(self) -> np.ndarray:
+        """ Start new games.
+
+        :return: initial states
+        :rtype:  np.ndarray
+        """
+        for conn in self._conns:
+            conn.send(('reset', None))
+        return np.stack([conn.recv() for conn in self._conns])
+
+    def close(self) -> None:
+        """ Close every game and its worker process. """
+        if self.closed:
+            return
+        for conn in self._conns:
+            try:
+                conn.send(('close', None))
+            except (BrokenPipeError, EOFError):
+                pass  # worker already died, e.g. its game raised
+        for proc in self._procs:
+            proc.join()
+        for conn in self._conns:
+            conn.close()
+        self.closed = True